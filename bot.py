@@ -1,23 +1,53 @@
 import asyncio
+import atexit
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import unquote, urlparse
 
 from aiogram import Bot, Dispatcher
 from aiogram.contrib.fsm_storage.memory import MemoryStorage
+from aiogram.contrib.fsm_storage.redis import RedisStorage2
 from aiogram.utils.exceptions import ValidationError
-from config import bot_token
+from config import bot_token, redis_url
+from http_client import close_session
 from web_server import HealthCheckServer
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("bot.log"), logging.StreamHandler(sys.stdout)],
+# Records are written to file/stdout by a background thread, so logging calls
+# never block the event loop on disk I/O
+log_formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
+file_handler = logging.FileHandler("bot.log")
+file_handler.setFormatter(log_formatter)
+stream_handler = logging.StreamHandler(sys.stdout)
+stream_handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, file_handler, stream_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Only the message is pre-formatted here; the listener's handlers add the rest
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 
 logger = logging.getLogger(__name__)
 
+# Use uvloop if available (must happen before the bot grabs an event loop)
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop")
+except ImportError:
+    pass
+
 # Initialize bot and dispatcher
 try:
     if not bot_token:
@@ -33,50 +63,80 @@ except Exception as e:
     bot = None
 
 # Create storage and dispatcher
-storage = MemoryStorage()
+if redis_url:
+    redis_conf = urlparse(redis_url)
+    storage = RedisStorage2(
+        host=redis_conf.hostname or "localhost",
+        port=redis_conf.port or 6379,
+        db=int(redis_conf.path.lstrip("/") or 0),
+        username=unquote(redis_conf.username) if redis_conf.username else None,
+        password=unquote(redis_conf.password) if redis_conf.password else None,
+        ssl=redis_conf.scheme == "rediss",
+        pool_size=10,
+    )
+    logger.info("Using Redis FSM storage")
+else:
+    storage = MemoryStorage()
 if bot:
     dp = Dispatcher(bot, storage=storage)
 
     # Initialize web server for health checks
     web_server = HealthCheckServer(bot, port=int(os.environ.get("PORT", 8080)))
+    web_runner = None
 
     # Import handlers after dp initialization
     from handlers import dp as handlers_dp
 
     async def on_startup(dp):
         """Actions on bot startup"""
+        global web_runner
         logger.info("Bot is starting up...")
 
         # Start web server for health checks
         try:
-            await web_server.start_server()
+            web_runner = await web_server.start_server()
             logger.info("Health check server started successfully")
         except Exception as e:
             logger.error(f"Failed to start health check server: {e}")
 
+        # Skip pending updates only after /health is already being served
+        await dp.skip_updates()
+
     async def on_shutdown(dp):
         """Actions on bot shutdown"""
         logger.info("Bot is shutting down...")
 
+        # Stop health check server
+        if web_runner is not None:
+            await web_runner.cleanup()
+
         # Close bot session
         await dp.storage.close()
         await dp.storage.wait_closed()
 
+        # Close shared HTTP session
+        await close_session()
+
         logger.info("Bot shutdown complete")
 
-    async def main():
+    def main():
         """Main function to start the bot"""
         if not bot:
             logger.error("Bot not initialized. Exiting.")
             return
 
+        # Eager tasks run synchronously until their first real suspension
+        if sys.version_info >= (3, 12):
+            loop = asyncio.get_event_loop()
+            loop.set_task_factory(asyncio.eager_task_factory)
+
         try:
             # Start polling
             from aiogram import executor
 
             logger.info("Starting bot polling...")
             executor.start_polling(
-                dp, on_startup=on_startup, on_shutdown=on_shutdown, skip_updates=True
+                dp, on_startup=on_startup, on_shutdown=on_shutdown, skip_updates=False
             )
 
         except Exception as e:
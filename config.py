@@ -1,19 +1,28 @@
 import os
-from typing import List
 import pytz
 from dotenv import load_dotenv
 from texts import PARTICIPATION_KEYWORD, START_TEXT
 
 load_dotenv()
 
-OWNERS: List[int] = []
-if os.getenv("OWNERS"):
-    OWNERS = [int(x.strip()) for x in os.getenv("OWNERS", "").split(",") if x.strip()]
+OWNERS: frozenset[int] = frozenset(
+    int(x.strip()) for x in os.getenv("OWNERS", "").split(",") if x.strip()
+)
 
 bot_token = os.getenv("BOT_TOKEN", "")
 
 database_url = os.getenv("DATABASE_URL", "sqlite://db.sqlite3")
 
+redis_url = os.getenv("REDIS_URL", "")
+
+try:
+    keep_alive_interval = max(1, int(os.getenv("KEEP_ALIVE_INTERVAL", "300")))
+except ValueError:
+    raise ValueError(
+        "KEEP_ALIVE_INTERVAL must be an integer number of seconds, "
+        f"got {os.getenv('KEEP_ALIVE_INTERVAL')!r}"
+    ) from None
+
 timezone_info = pytz.timezone(os.getenv("TIMEZONE", "Europe/Moscow"))
 
 start_text = START_TEXT
@@ -0,0 +1,25 @@
+import aiohttp
+
+_session = None
+
+
+async def get_session():
+    """Получить общую для всего процесса HTTP-сессию (создаётся лениво)"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                enable_cleanup_closed=True,
+            )
+        )
+    return _session
+
+
+async def close_session():
+    """Закрыть общую HTTP-сессию"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
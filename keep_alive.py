@@ -1,15 +1,18 @@
 import asyncio
 import logging
+import os
 import time
 from datetime import datetime, timedelta
 
 import aiohttp
+from config import keep_alive_interval
+from http_client import close_session, get_session
 
 logger = logging.getLogger(__name__)
 
 
 class UptimeMonitor:
-    def __init__(self, url, interval=300, timeout=10):
+    def __init__(self, url, interval=300, timeout=10, max_consecutive_failures=10):
         """
         Инициализация монитора времени работы
 
@@ -17,33 +20,47 @@ class UptimeMonitor:
             url: URL для ping-а (health check endpoint)
             interval: Интервал между проверками в секундах (по умолчанию 5 минут)
             timeout: Таймаут запроса в секундах
+            max_consecutive_failures: После стольких неудачных пингов подряд
+                мониторинг останавливается
         """
         self.url = url
         self.interval = interval
         self.timeout = timeout
+        self.max_consecutive_failures = max_consecutive_failures
+        self.consecutive_failures = 0
         self.start_time = datetime.now()
+        self._start_mono = time.monotonic()
         self.last_ping = None
         self.ping_count = 0
         self.failed_pings = 0
         self.is_running = False
+        self._stop = None
+
+    async def _wait_stop(self, timeout):
+        """Подождать timeout секунд; вернуть True, если запрошена остановка"""
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     async def ping_service(self):
         """Отправить ping запрос к сервису"""
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            ) as session:
-                async with session.get(self.url) as response:
-                    self.ping_count += 1
-                    self.last_ping = datetime.now()
-
-                    if response.status == 200:
-                        logger.info(f"✅ Ping successful - Status: {response.status}")
-                        return True
-                    else:
-                        logger.warning(f"⚠️ Ping returned status: {response.status}")
-                        self.failed_pings += 1
-                        return False
+            session = await get_session()
+            async with session.request(
+                "OPTIONS", self.url, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                self.ping_count += 1
+                self.last_ping = datetime.now()
+
+                if response.status == 200:
+                    logger.info(f"✅ Ping successful - Status: {response.status}")
+                    return True
+                else:
+                    logger.warning(f"⚠️ Ping returned status: {response.status}")
+                    self.failed_pings += 1
+                    return False
 
         except asyncio.TimeoutError:
             logger.error(f"⏰ Ping timeout after {self.timeout}s")
@@ -60,7 +77,7 @@ class UptimeMonitor:
 
     def get_uptime_stats(self):
         """Получить статистику времени работы"""
-        uptime = datetime.now() - self.start_time
+        uptime_seconds = time.monotonic() - self._start_mono
         success_rate = (
             ((self.ping_count - self.failed_pings) / self.ping_count * 100)
             if self.ping_count > 0
@@ -69,8 +86,8 @@ class UptimeMonitor:
 
         return {
             "start_time": self.start_time.isoformat(),
-            "uptime_seconds": uptime.total_seconds(),
-            "uptime_formatted": self.format_duration(uptime.total_seconds()),
+            "uptime_seconds": uptime_seconds,
+            "uptime_formatted": self.format_duration(uptime_seconds),
             "last_ping": self.last_ping.isoformat() if self.last_ping else None,
             "total_pings": self.ping_count,
             "failed_pings": self.failed_pings,
@@ -99,46 +116,71 @@ class UptimeMonitor:
     async def start_monitoring(self):
         """Запустить мониторинг"""
         self.is_running = True
+        # Event создаётся здесь, чтобы привязаться к циклу, который его ждёт
+        self._stop = asyncio.Event()
         logger.info(f"🚀 Starting uptime monitor for {self.url}")
         logger.info(f"📊 Ping interval: {self.interval} seconds")
         logger.info(f"⏱️ Request timeout: {self.timeout} seconds")
 
+        # При неудачах интервал удваивается, но не более чем в 8 раз
+        current_interval = self.interval
+        max_interval = self.interval * 8
+
         # Первый ping сразу
-        await self.ping_service()
+        first_ping = True
 
         while self.is_running:
             try:
-                await asyncio.sleep(self.interval)
-
-                if self.is_running:  # Проверяем еще раз после сна
-                    await self.ping_service()
-
-                    # Логируем статистику каждые 10 пингов
-                    if self.ping_count % 10 == 0:
-                        stats = self.get_uptime_stats()
-                        logger.info(
-                            f"📈 Stats: {stats['total_pings']} pings, "
-                            f"{stats['success_rate']}% success, "
-                            f"uptime: {stats['uptime_formatted']}"
+                if not first_ping and await self._wait_stop(current_interval):
+                    break
+                first_ping = False
+
+                if await self.ping_service():
+                    self.consecutive_failures = 0
+                    current_interval = self.interval
+                else:
+                    self.consecutive_failures += 1
+                    current_interval = min(current_interval * 2, max_interval)
+                    if self.consecutive_failures >= self.max_consecutive_failures:
+                        logger.error(
+                            f"🚫 {self.consecutive_failures} failed pings in a row, "
+                            "giving up"
                         )
+                        break
+
+                # Логируем статистику каждые 10 пингов
+                if self.ping_count and self.ping_count % 10 == 0:
+                    rate = (
+                        (self.ping_count - self.failed_pings) / self.ping_count * 100
+                    )
+                    uptime = self.format_duration(time.monotonic() - self._start_mono)
+                    logger.info(
+                        f"📈 Stats: {self.ping_count} pings, "
+                        f"{rate:.2f}% success, "
+                        f"uptime: {uptime}"
+                    )
 
             except asyncio.CancelledError:
                 logger.info("🛑 Monitoring cancelled")
                 break
             except Exception as e:
                 logger.error(f"💥 Error in monitoring loop: {e}")
-                await asyncio.sleep(30)  # Короткая пауза при ошибке
+                # Короткая пауза при ошибке
+                if await self._wait_stop(30):
+                    break
 
         logger.info("🏁 Uptime monitor stopped")
 
     def stop_monitoring(self):
         """Остановить мониторинг"""
         self.is_running = False
+        if self._stop is not None:
+            self._stop.set()
         logger.info("🛑 Stopping uptime monitor...")
 
 
 # Функция для использования в других модулях
-async def keep_alive(url, interval=300):
+async def keep_alive(url, interval=keep_alive_interval):
     """
     Простая функция для поддержания работы сервиса
 
@@ -146,6 +188,13 @@ async def keep_alive(url, interval=300):
         url: URL для ping-а
         interval: Интервал между пингами в секундах
     """
+    if not url:
+        logger.info("Keep alive is disabled, no ping URL configured")
+        return
+    if os.getenv("DISABLE_KEEPALIVE"):
+        logger.info("Keep alive is disabled by DISABLE_KEEPALIVE")
+        return
+
     monitor = UptimeMonitor(url, interval)
 
     try:
@@ -195,16 +244,26 @@ if __name__ == "__main__":
         try:
             ping_interval = int(sys.argv[2])
         except ValueError:
-            ping_interval = 300
+            ping_interval = keep_alive_interval
     else:
-        ping_interval = 300
+        ping_interval = keep_alive_interval
 
     print(f"🎯 Мониторинг: {ping_url}")
     print(f"⏰ Интервал: {ping_interval} секунд")
     print("Press Ctrl+C to stop...")
 
     async def main():
-        await keep_alive(ping_url, ping_interval)
+        try:
+            await keep_alive(ping_url, ping_interval)
+        finally:
+            await close_session()
+
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
 
     try:
         asyncio.run(main())
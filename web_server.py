@@ -1,102 +1,168 @@
 import asyncio
 import logging
 import os
+import sys
+import time
 from datetime import datetime
 
-import aiohttp_cors
+import orjson
 from aiohttp import web
 
 logger = logging.getLogger(__name__)
 
 
+@web.middleware
+async def cors_middleware(request, handler):
+    """Разрешить CORS для всех маршрутов, включая preflight-запросы"""
+    is_preflight = (
+        request.method == "OPTIONS"
+        and "Access-Control-Request-Method" in request.headers
+        and not isinstance(request.match_info.http_exception, web.HTTPNotFound)
+    )
+    if is_preflight:
+        response = web.Response(status=200)
+        response.headers["Access-Control-Allow-Methods"] = request.headers[
+            "Access-Control-Request-Method"
+        ]
+        response.headers["Access-Control-Allow-Headers"] = request.headers.get(
+            "Access-Control-Request-Headers", "*"
+        )
+    else:
+        response = await handler(request)
+        response.headers["Access-Control-Expose-Headers"] = "*"
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+_DAY = ("день", "дня", "дней")
+_HOUR = ("час", "часа", "часов")
+_MIN = ("минута", "минуты", "минут")
+_SEC = ("секунда", "секунды", "секунд")
+
+
+def _plural(n, forms):
+    """Выбрать форму слова для числа n (1 / 2-4 / 5+)"""
+    n %= 100
+    if 11 <= n <= 14:
+        return forms[2]
+    n %= 10
+    if n == 1:
+        return forms[0]
+    if 2 <= n <= 4:
+        return forms[1]
+    return forms[2]
+
+
+def _json(payload, status=200):
+    """JSON-ответ, сериализованный через orjson"""
+    return web.Response(
+        body=orjson.dumps(payload), content_type="application/json", status=status
+    )
+
+
 class HealthCheckServer:
     def __init__(self, bot=None, port=8080):
         self.bot = bot
         self.port = port
         self.start_time = datetime.now()
-        self.app = web.Application()
+        self._start_mono = time.monotonic()
+        self._cached_health = b""
+        self._health_task = None
+        self.app = web.Application(middlewares=[cors_middleware])
+        self.app.on_cleanup.append(self._stop_health_refresh)
         self.setup_routes()
-        self.setup_cors()
-
-    def setup_cors(self):
-        # Настройка CORS для всех маршрутов
-        cors = aiohttp_cors.setup(
-            self.app,
-            defaults={
-                "*": aiohttp_cors.ResourceOptions(
-                    allow_credentials=True,
-                    expose_headers="*",
-                    allow_headers="*",
-                    allow_methods="*",
-                )
-            },
-        )
-
-        # Добавляем CORS ко всем маршрутам
-        for route in list(self.app.router.routes()):
-            cors.add(route)
 
     def setup_routes(self):
         # Health check endpoint
         self.app.router.add_get("/", self.health_check)
+        self.app.router.add_route("OPTIONS", "/", self._options_ok)
         self.app.router.add_get("/health", self.health_check)
+        self.app.router.add_route("OPTIONS", "/health", self._options_ok)
+        self.app.router.add_get("/healthz", self.healthz)
         self.app.router.add_get("/status", self.bot_status)
         self.app.router.add_get("/uptime", self.uptime)
 
-    async def health_check(self, request):
-        """Простая проверка здоровья"""
-        return web.json_response(
+    def _build_health(self):
+        """Сериализовать тело ответа health check"""
+        return orjson.dumps(
             {
                 "status": "healthy",
                 "service": "telegram-giveaway-bot",
-                "timestamp": datetime.now().isoformat(),
-                "uptime_seconds": (datetime.now() - self.start_time).total_seconds(),
+                "timestamp": datetime.now(),
+                "uptime_seconds": time.monotonic() - self._start_mono,
             }
         )
 
+    async def _refresh_health_loop(self):
+        """Обновлять кэшированный ответ health check раз в секунду"""
+        while True:
+            self._cached_health = self._build_health()
+            await asyncio.sleep(1)
+
+    async def _stop_health_refresh(self, app):
+        """Остановить фоновое обновление кэша при остановке приложения"""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+
+    async def health_check(self, request):
+        """Простая проверка здоровья"""
+        if not self._cached_health:
+            self._cached_health = self._build_health()
+        return web.Response(body=self._cached_health, content_type="application/json")
+
+    async def healthz(self, request):
+        """Минимальная liveness-проверка для внешних мониторов"""
+        return web.Response(body=b"ok\n", content_type="text/plain")
+
+    async def _options_ok(self, request):
+        """Лёгкая liveness-проверка без тела ответа"""
+        return web.Response(status=200)
+
     async def bot_status(self, request):
         """Статус бота"""
         try:
             if self.bot:
-                bot_info = await self.bot.get_me()
-                return web.json_response(
+                # bot.me кэширует результат get_me() на время жизни бота
+                bot_info = await self.bot.me
+                return _json(
                     {
                         "bot_status": "running",
                         "bot_username": bot_info.username,
                         "bot_id": bot_info.id,
                         "bot_name": bot_info.first_name,
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": datetime.now(),
                     }
                 )
             else:
-                return web.json_response(
+                return _json(
                     {
                         "bot_status": "not_initialized",
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": datetime.now(),
                     }
                 )
         except Exception as e:
             logger.error(f"Error getting bot status: {e}")
-            return web.json_response(
+            return _json(
                 {
                     "bot_status": "error",
                     "error": str(e),
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": datetime.now(),
                 },
                 status=500,
             )
 
     async def uptime(self, request):
         """Время работы сервиса"""
-        uptime_seconds = (datetime.now() - self.start_time).total_seconds()
+        uptime_seconds = time.monotonic() - self._start_mono
         uptime_minutes = uptime_seconds / 60
         uptime_hours = uptime_minutes / 60
         uptime_days = uptime_hours / 24
 
-        return web.json_response(
+        return _json(
             {
-                "start_time": self.start_time.isoformat(),
-                "current_time": datetime.now().isoformat(),
+                "start_time": self.start_time,
+                "current_time": datetime.now(),
                 "uptime": {
                     "seconds": round(uptime_seconds, 2),
                     "minutes": round(uptime_minutes, 2),
@@ -116,37 +182,28 @@ class HealthCheckServer:
 
         parts = []
         if days > 0:
-            parts.append(
-                f"{days} день"
-                + ("" if days == 1 else ("а" if 2 <= days <= 4 else "ей"))
-            )
+            parts.append(f"{days} {_plural(days, _DAY)}")
         if hours > 0:
-            parts.append(
-                f"{hours} час"
-                + ("" if hours == 1 else ("а" if 2 <= hours <= 4 else "ов"))
-            )
+            parts.append(f"{hours} {_plural(hours, _HOUR)}")
         if minutes > 0:
-            parts.append(
-                f"{minutes} минут"
-                + ("а" if minutes == 1 else ("ы" if 2 <= minutes <= 4 else ""))
-            )
+            parts.append(f"{minutes} {_plural(minutes, _MIN)}")
         if secs > 0 or not parts:
-            parts.append(
-                f"{secs} секунд"
-                + ("а" if secs == 1 else ("ы" if 2 <= secs <= 4 else ""))
-            )
+            parts.append(f"{secs} {_plural(secs, _SEC)}")
 
         return ", ".join(parts)
 
     async def start_server(self):
         """Запуск веб-сервера"""
         try:
-            runner = web.AppRunner(self.app)
+            # Access log отключен: эндпоинты постоянно опрашиваются мониторами
+            runner = web.AppRunner(self.app, access_log=None)
             await runner.setup()
 
             site = web.TCPSite(runner, "0.0.0.0", self.port)
             await site.start()
 
+            self._health_task = asyncio.create_task(self._refresh_health_loop())
+
             logger.info(f"Health check server started on port {self.port}")
             logger.info(
                 f"Health check available at: http://localhost:{self.port}/health"
@@ -162,6 +219,10 @@ class HealthCheckServer:
 if __name__ == "__main__":
 
     async def main():
+        if sys.version_info >= (3, 12):
+            loop = asyncio.get_running_loop()
+            loop.set_task_factory(asyncio.eager_task_factory)
+
         # Создаем сервер для тестирования
         server = HealthCheckServer()
         runner = await server.start_server()
@@ -170,6 +231,8 @@ if __name__ == "__main__":
         print("Available endpoints:")
         print("  GET /         - Main health check")
         print("  GET /health   - Health check")
+        print("  OPTIONS /, /health - Liveness ping")
+        print("  GET /healthz  - Plain-text liveness check")
         print("  GET /status   - Bot status")
         print("  GET /uptime   - Service uptime")
         print("Press Ctrl+C to stop...")
@@ -183,5 +246,12 @@ if __name__ == "__main__":
         finally:
             await runner.cleanup()
 
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     # Запускаем сервер
     asyncio.run(main())